@@ -0,0 +1,55 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, nonecheck=False, initializedcheck=False
+"""
+Parsers de la interfaz compilados con Cython (ver solvers.py para la versión de Python).
+"""
+
+
+cpdef list parse_lista(str texto):
+    """
+    Convierte una cadena de texto separada por comas en una lista de elementos limpios.
+    """
+    cdef list resultado = []
+    cdef str item
+    for item in texto.split(","):
+        item = item.strip()
+        if item:
+            resultado.append(item.replace(" ", "_"))
+    return resultado
+
+
+cpdef tuple parse_restricciones(list restricciones_input, frozenset param_names, dict op_codigos):
+    """
+    Devuelve (restricciones, errores): las restricciones válidas como tuplas
+    (parametro, codigo_operador, valor) y los mensajes de las entradas descartadas.
+    `op_codigos` es la tabla símbolo -> código de solvers.py.
+    """
+    cdef list restricciones = []
+    cdef list errores = []
+    cdef Py_ssize_t idx
+    cdef dict restr
+    cdef object parametro, operador, codigo
+    cdef double valor
+
+    for idx in range(len(restricciones_input)):
+        restr = restricciones_input[idx]
+        parametro = restr.get('parametro')
+        operador = restr.get('operador')
+
+        if parametro not in param_names:
+            errores.append(f"Restricción {idx+1}: Parámetro '{parametro}' no reconocido.")
+            continue
+        codigo = op_codigos.get(operador)
+        if codigo is None:
+            errores.append(f"Restricción {idx+1}: Operador '{operador}' no válido.")
+            continue
+        try:
+            valor = float(restr.get('valor'))
+        except (TypeError, ValueError):
+            errores.append(f"Restricción {idx+1}: Valor '{restr.get('valor')}' no es numérico.")
+            continue
+        if valor != valor:  # NaN: celda vacía en la tabla de restricciones
+            errores.append(f"Restricción {idx+1}: Valor '{restr.get('valor')}' no es numérico.")
+            continue
+
+        restricciones.append((parametro, codigo, valor))
+    return restricciones, errores
@@ -0,0 +1,174 @@
+import ast
+import math
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+class NoLineal(Exception):
+    """
+    La expresión no es lineal en las variables indicadas.
+    """
+
+
+class _Linealizador(ast.NodeVisitor):
+    """
+    Recorre el AST de una expresión y devuelve el par (coeficientes, constante)
+    si es lineal en las variables; en otro caso lanza NoLineal.
+    """
+
+    def __init__(self, variables):
+        self.variables = set(variables)
+
+    def visit_Expression(self, node):
+        return self.visit(node.body)
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise NoLineal(f"Constante '{node.value}' no numérica.")
+        return {}, float(node.value)
+
+    def visit_Name(self, node):
+        if node.id not in self.variables:
+            raise NoLineal(f"Nombre '{node.id}' no es una variable.")
+        return {node.id: 1.0}, 0.0
+
+    def visit_UnaryOp(self, node):
+        coefs, const = self.visit(node.operand)
+        if isinstance(node.op, ast.UAdd):
+            return coefs, const
+        if isinstance(node.op, ast.USub):
+            return _escalar(coefs, const, -1.0)
+        raise NoLineal("Operador unario no lineal.")
+
+    def visit_BinOp(self, node):
+        if isinstance(node.op, (ast.Add, ast.Sub)):
+            return self._visitar_suma(node)
+
+        coefs_izq, const_izq = self.visit(node.left)
+        coefs_der, const_der = self.visit(node.right)
+
+        if isinstance(node.op, ast.Mult):
+            # Producto de dos términos con variables (x*y) no es lineal
+            if not coefs_izq:
+                return _escalar(coefs_der, const_der, const_izq)
+            if not coefs_der:
+                return _escalar(coefs_izq, const_izq, const_der)
+            raise NoLineal("Producto entre variables.")
+        if isinstance(node.op, ast.Div):
+            if not coefs_der and const_der != 0:
+                return _escalar(coefs_izq, const_izq, 1.0 / const_der)
+            raise NoLineal("División por una variable o por cero.")
+        if isinstance(node.op, ast.Pow):
+            if not coefs_izq and not coefs_der:
+                try:
+                    resultado = const_izq ** const_der
+                except (OverflowError, ZeroDivisionError):
+                    raise NoLineal("Potencia constante fuera de rango.")
+                if isinstance(resultado, complex):
+                    raise NoLineal("Potencia constante con resultado complejo.")
+                return {}, resultado
+            raise NoLineal("Potencia de una variable.")
+        raise NoLineal("Operador binario no lineal.")
+
+    def _visitar_suma(self, node):
+        # a + b - c + ... es un árbol que se anida por la izquierda: se recorre con un bucle para que
+        # una suma de cientos de términos no agote la pila de recursión
+        terminos = []
+        while isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub)):
+            terminos.append((1.0 if isinstance(node.op, ast.Add) else -1.0, node.right))
+            node = node.left
+        coefs, const = self.visit(node)
+        for signo, derecho in reversed(terminos):
+            coefs_der, const_der = self.visit(derecho)
+            coefs, const = _sumar(coefs, const, coefs_der, const_der, signo)
+        return coefs, const
+
+    def generic_visit(self, node):
+        # Llamadas (sin, exp, ...), atributos, comparaciones, etc.
+        raise NoLineal(f"Construcción '{type(node).__name__}' no lineal.")
+
+
+def _escalar(coefs, const, factor):
+    return {v: a * factor for v, a in coefs.items()}, const * factor
+
+
+def _sumar(coefs_izq, const_izq, coefs_der, const_der, signo):
+    coefs = dict(coefs_izq)
+    for v, a in coefs_der.items():
+        coefs[v] = coefs.get(v, 0.0) + signo * a
+    return coefs, const_izq + signo * const_der
+
+
+def extraer_coeficientes(expr, variables):
+    """
+    Devuelve ({variable: coeficiente}, constante) de una expresión lineal.
+    Lanza NoLineal (o SyntaxError) si la expresión no es lineal.
+    """
+    arbol = ast.parse(expr, mode='eval')
+    coefs, const = _Linealizador(variables).visit(arbol)
+    # Un coeficiente infinito o NaN (1e300*1e300*x) no se puede pasar a linprog
+    if not all(math.isfinite(a) for a in coefs.values()) or not math.isfinite(const):
+        raise NoLineal("Coeficiente no finito.")
+    return coefs, const
+
+
+def is_linear(expr, variables):
+    """
+    Indica si la expresión es lineal en las variables dadas. Una expresión demasiado anidada para
+    analizarla (RecursionError) se trata como no lineal.
+    """
+    try:
+        extraer_coeficientes(expr, variables)
+    except (NoLineal, SyntaxError, RecursionError):
+        return False
+    return True
+
+
+def matrices_lineales(funcion_objetivo, restricciones, variables):
+    """
+    Arma (c, c0, A_ub, b_ub, A_eq, b_eq) para linprog a partir de expresiones lineales.
+    Las restricciones '>=' se invierten a '<=' y las constantes pasan al lado derecho.
+    A_ub y A_eq son matrices dispersas (CSR) armadas solo con los coeficientes no nulos.
+    """
+    col = {v: j for j, v in enumerate(variables)}
+
+    coefs, c0 = extraer_coeficientes(funcion_objetivo, variables)
+    c = np.zeros(len(variables))
+    for v, a in coefs.items():
+        c[col[v]] = a
+
+    # Tripletas (fila, columna, coeficiente) de cada matriz y sus lados derechos
+    ub = ([], [], [], [])
+    eq = ([], [], [], [])
+    for restr in restricciones:
+        coefs, const = extraer_coeficientes(restr['expresion'], variables)
+        lado = float(restr['valor']) - const
+
+        if restr['operador'] == "<=":
+            destino, signo = ub, 1.0
+        elif restr['operador'] == ">=":
+            destino, signo = ub, -1.0
+        elif restr['operador'] == "==":
+            destino, signo = eq, 1.0
+        else:
+            raise NoLineal(f"Operador '{restr['operador']}' no soportado por linprog.")
+
+        filas, columnas, datos, lados = destino
+        fila = len(lados)
+        for v, a in coefs.items():
+            if a != 0.0:
+                filas.append(fila)
+                columnas.append(col[v])
+                datos.append(signo * a)
+        lados.append(signo * lado)
+
+    A_ub, b_ub = _dispersa(*ub, len(variables))
+    A_eq, b_eq = _dispersa(*eq, len(variables))
+    return c, c0, A_ub, b_ub, A_eq, b_eq
+
+
+def _dispersa(filas, columnas, datos, lados, n_columnas):
+    if not lados:
+        return None, None
+    A = csr_matrix((datos, (filas, columnas)), shape=(len(lados), n_columnas))
+    return A, np.array(lados)
@@ -0,0 +1,138 @@
+import ast
+import math
+import operator
+
+from pyomo.environ import sin, cos, exp, log
+
+# Construcciones permitidas en las expresiones del usuario
+_BINARIOS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+_UNARIOS = {ast.USub: operator.neg, ast.UAdd: operator.pos}
+_FUNCIONES_PYOMO = {"sin": sin, "cos": cos, "exp": exp, "log": log}
+_FUNCIONES_MATH = {"sin": math.sin, "cos": math.cos, "exp": math.exp, "log": math.log}
+
+
+class ExpresionCompilada:
+    """
+    Expresión del usuario ya validada. Se puede convertir en expresión de Pyomo
+    o evaluar numéricamente.
+    """
+
+    def __init__(self, arbol, variables):
+        self.arbol = arbol
+        self.variables = tuple(variables)
+        self._python = None
+
+    def pyomo(self, vars_modelo):
+        """
+        Construye la expresión de Pyomo sustituyendo cada nombre por su variable del modelo.
+        """
+        return _a_pyomo(self.arbol.body, vars_modelo)
+
+    def evaluar(self, valores):
+        """
+        Evalúa la expresión en un punto dado en el orden de `variables`.
+        """
+        if self._python is None:
+            self._python = _a_python(self.arbol, self.variables)
+        return self._python(*valores)
+
+
+def _validar(node, variables):
+    if isinstance(node, ast.Expression):
+        _validar(node.body, variables)
+    elif isinstance(node, ast.BinOp) and type(node.op) in _BINARIOS:
+        _validar(node.left, variables)
+        _validar(node.right, variables)
+    elif isinstance(node, ast.UnaryOp) and type(node.op) in _UNARIOS:
+        _validar(node.operand, variables)
+    elif isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"Constante '{node.value}' no permitida.")
+    elif isinstance(node, ast.Name):
+        if node.id not in variables:
+            raise ValueError(f"Variable '{node.id}' no definida.")
+    elif isinstance(node, ast.Call):
+        if not (isinstance(node.func, ast.Name) and node.func.id in _FUNCIONES_PYOMO):
+            raise ValueError(f"Función no permitida; use {', '.join(_FUNCIONES_PYOMO)}.")
+        if len(node.args) != 1 or node.keywords:
+            raise ValueError(f"La función '{node.func.id}' recibe un único argumento.")
+        _validar(node.args[0], variables)
+    else:
+        raise ValueError(f"Construcción '{type(node).__name__}' no permitida.")
+
+
+def _plegar(node):
+    """
+    Reemplaza cada subexpresión sin variables por su valor en punto flotante, como hace
+    analysis.py. Así 9**9**9 no se calcula con enteros de precisión arbitraria (que por
+    tiempo y memoria bloquearía el proceso), sino que falla por desbordamiento.
+    Lanza ValueError si el valor no es un número real finito.
+    """
+    if isinstance(node, ast.Expression):
+        node.body = _plegar(node.body)
+        return node
+    if isinstance(node, ast.BinOp):
+        node.left, node.right = _plegar(node.left), _plegar(node.right)
+        argumentos = (node.left, node.right)
+        funcion = _BINARIOS[type(node.op)]
+    elif isinstance(node, ast.UnaryOp):
+        node.operand = _plegar(node.operand)
+        argumentos = (node.operand,)
+        funcion = _UNARIOS[type(node.op)]
+    elif isinstance(node, ast.Call):
+        node.args[0] = _plegar(node.args[0])
+        argumentos = (node.args[0],)
+        funcion = _FUNCIONES_MATH[node.func.id]
+    else:
+        return node
+
+    if not all(isinstance(a, ast.Constant) for a in argumentos):
+        return node
+    try:
+        valor = funcion(*(float(a.value) for a in argumentos))
+    except (OverflowError, ZeroDivisionError, ValueError):
+        raise ValueError("Subexpresión constante fuera de rango o no definida.")
+    if isinstance(valor, complex):
+        raise ValueError("Potencia constante con resultado complejo.")
+    if not math.isfinite(valor):
+        raise ValueError("Subexpresión constante no finita.")
+    return ast.copy_location(ast.Constant(valor), node)
+
+
+def _a_pyomo(node, vars_modelo):
+    if isinstance(node, ast.BinOp):
+        return _BINARIOS[type(node.op)](_a_pyomo(node.left, vars_modelo), _a_pyomo(node.right, vars_modelo))
+    if isinstance(node, ast.UnaryOp):
+        return _UNARIOS[type(node.op)](_a_pyomo(node.operand, vars_modelo))
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name):
+        return vars_modelo[node.id]
+    return _FUNCIONES_PYOMO[node.func.id](_a_pyomo(node.args[0], vars_modelo))
+
+
+def _a_python(arbol, variables):
+    """
+    Convierte el árbol en una función `lambda *variables: ...` de Python.
+    """
+    argumentos = ast.arguments(posonlyargs=[], args=[ast.arg(arg=v) for v in variables],
+                               kwonlyargs=[], kw_defaults=[], defaults=[])
+    lambda_ = ast.fix_missing_locations(ast.Expression(body=ast.Lambda(args=argumentos, body=arbol.body)))
+    return eval(compile(lambda_, "<expr>", "eval"), dict(_FUNCIONES_MATH))
+
+
+def compile_expr(src, variables):
+    """
+    Analiza la expresión `src` y la valida contra una lista blanca de operaciones
+    (+, -, *, /, **, sin, cos, exp, log) y de nombres (`variables`).
+    Lanza SyntaxError o ValueError si la expresión no es válida.
+    """
+    arbol = ast.parse(src, mode="eval")
+    _validar(arbol, set(variables))
+    return ExpresionCompilada(_plegar(arbol), variables)
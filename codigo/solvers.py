@@ -1,56 +1,502 @@
+import itertools
+import math
+import operator
+import threading
 import streamlit as st
 from pyomo.environ import *
+from pyomo.core.expr.numeric_expr import LinearExpression
 import numpy as np
+import pandas as pd
 from pyomo.opt import SolverStatus, TerminationCondition
+from scipy.optimize import linprog
+from scipy.sparse import csr_matrix, diags
+from analysis import is_linear, matrices_lineales
+from exprc import compile_expr
+
+# ---------------------------
+# Parsers (versión de Python; se reemplaza por _parsers.pyx si Cython está disponible)
+# ---------------------------
+
+# Símbolo de la interfaz y operador de Pyomo de cada código; los parsers devuelven el código del símbolo
+_OPERADORES = ("≤", "≥", "=", "<", ">", "≠")
+_OPERADORES_CODIGO = ("<=", ">=", "==", "<", ">", "!=")
+_OP_CODIGOS = {simbolo: codigo for codigo, simbolo in enumerate(_OPERADORES)}
+
+# Únicos operadores que GLPK, HiGHS e IPOPT pueden representar (Pyomo sobrecarga las comparaciones);
+# _STRICT marca por código las desigualdades estrictas y '≠'
+_OPS = {"<=": operator.le, ">=": operator.ge, "==": operator.eq}
+_STRICT = np.array([False, False, False, True, True, True])
+
+def _parse_lista_py(texto):
+    return [item.strip().replace(" ", "_") for item in texto.split(",") if item.strip()]
+
+def _parse_restricciones_py(restricciones_input, param_names, op_codigos):
+    restricciones = []
+    errores = []
+    for idx, restr in enumerate(restricciones_input):
+        parametro = restr.get('parametro')
+        operador = restr.get('operador')
+        valor = restr.get('valor')
+
+        if parametro not in param_names:
+            errores.append(f"Restricción {idx+1}: Parámetro '{parametro}' no reconocido.")
+            continue
+        if operador not in op_codigos:
+            errores.append(f"Restricción {idx+1}: Operador '{operador}' no válido.")
+            continue
+        try:
+            valor = float(valor)
+            if math.isnan(valor):
+                raise ValueError
+        except (TypeError, ValueError):
+            errores.append(f"Restricción {idx+1}: Valor '{restr.get('valor')}' no es numérico.")
+            continue
+
+        restricciones.append((parametro, op_codigos[operador], valor))
+    return restricciones, errores
+
+def _descartar_estrictas(restricciones, codigos):
+    """
+    Descarta, con un único mensaje de error, las restricciones cuyo código de operador es una
+    desigualdad estricta o '≠'; los códigos se comprueban todos de una vez.
+    """
+    estrictas = _STRICT[np.asarray(codigos, dtype=np.uint8)]
+    if not estrictas.any():
+        return restricciones
+
+    st.error(f"Se omitieron {int(estrictas.sum())} restricción(es): las desigualdades estrictas y '≠' "
+             "no son soportadas por los solvers; use ≤, ≥ o =.")
+    return [restr for restr, estricta in zip(restricciones, estrictas) if not estricta]
+
+def _restricciones_desde_tabla(filas):
+    """
+    Convierte las filas (expresion, operador, valor) de la tabla de restricciones al formato del
+    modelo, descartando con un mensaje de error las que tienen un operador desconocido, un valor
+    no numérico o una desigualdad estricta.
+    """
+    restricciones = []
+    codigos = []
+    for idx, fila in enumerate(filas):
+        codigo = _OP_CODIGOS.get(fila['operador'])
+        if codigo is None:
+            st.error(f"Restricción {idx+1}: Operador '{fila['operador']}' no válido.")
+            continue
+        try:
+            valor = float(fila['valor'])
+            if math.isnan(valor):
+                raise ValueError
+        except (TypeError, ValueError):
+            st.error(f"Restricción {idx+1}: Valor '{fila['valor']}' no es numérico.")
+            continue
+        restricciones.append({
+            'expresion': fila['expresion'] or "",
+            'operador': _OPERADORES_CODIGO[codigo],
+            'valor': valor
+        })
+        codigos.append(codigo)
+    return _descartar_estrictas(restricciones, codigos)
+
+try:
+    import pyximport
+    pyximport.install(language_level=3)
+    from _parsers import parse_lista as _parse_lista, parse_restricciones as _parse_restricciones
+except ImportError:  # Sin Cython (o sin compilador) se usan las versiones de Python
+    _parse_lista, _parse_restricciones = _parse_lista_py, _parse_restricciones_py
+
+# ---------------------------
+# Componentes de la interfaz
+# ---------------------------
+
+_SENSE = {"Maximizar": maximize, "Minimizar": minimize}
+
+# Con st.fragment (Streamlit ≥ 1.37, experimental_fragment desde 1.33) editar un widget solo vuelve a
+# ejecutar el fragmento; en versiones anteriores se ejecuta todo el script, como antes.
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda funcion: funcion)
+
+def _aplanar(param_values):
+    """
+    Pasa {parámetro: {elemento: valor}} a {(parámetro, elemento): valor}.
+    """
+    return {(p, e): v for p, valores in param_values.items() for e, v in valores.items()}
+
+def _tabla_parametros(flat_defaults, elementos, param_names, key):
+    """
+    Tabla editable elementos × parámetros (un solo widget); devuelve {parámetro: {elemento: valor}}.
+    `flat_defaults` es {(parámetro, elemento): valor}; las celdas sin valor por defecto empiezan en 1.0.
+    """
+    default_df = (pd.Series(flat_defaults, dtype=float)
+                  .unstack(level=0)
+                  .reindex(index=elementos, columns=param_names)
+                  .fillna(1.0))
+    edited = st.data_editor(
+        default_df,
+        num_rows="fixed",
+        column_config={p: st.column_config.NumberColumn(p, required=True) for p in param_names},
+        key=key,
+    )
+    return {p: edited[p].to_dict() for p in param_names}
+
+def _restricciones_con_parametros(filas_default, param_names):
+    """
+    Usa el parámetro de cada fila por defecto si existe; si no, el primero de la lista.
+    """
+    return [(parametro if parametro in param_names else (param_names[0] if param_names else None), operador, valor)
+            for parametro, operador, valor in filas_default]
+
+def _tabla_restricciones(filas_default, columna, config_columna, key):
+    """
+    Tabla editable de restricciones, una fila por restricción con columnas `columna`, operador y valor.
+    Se pueden agregar o quitar filas desde la propia tabla.
+    """
+    default_df = pd.DataFrame(filas_default, columns=[columna, "operador", "valor"]).astype({"valor": float})
+    # Un operador por defecto que no está en la lista se reemplaza por el primero
+    default_df["operador"] = default_df["operador"].where(default_df["operador"].isin(_OPERADORES), _OPERADORES[0])
+    editadas = st.data_editor(
+        default_df,
+        num_rows="dynamic",
+        hide_index=True,
+        column_config={
+            columna: config_columna,
+            "operador": st.column_config.SelectboxColumn("Operador", options=_OPERADORES, required=True),
+            "valor": st.column_config.NumberColumn("Valor", required=True),
+        },
+        key=key,
+    )
+    return editadas.to_dict("records")
+
+# ---------------------------
+# Ruta rápida lineal (linprog / HiGHS)
+# ---------------------------
+
+@st.cache_data(max_entries=32)
+def _extract_lp_matrices(P, param_names, restr_frozen, obj_param):
+    """
+    Arma (c, A_ub, b_ub, A_eq, b_eq) de linprog para LP/IP tomando filas de la matriz de
+    parámetros P (parámetros × elementos), con A_ub y A_eq dispersas; memorizado entre clics de "Resolver".
+    `restr_frozen` contiene tuplas (parametro, codigo_operador, valor).
+    Lanza ValueError si alguna restricción usa un operador que linprog no admite.
+    """
+    pidx = {p: i for i, p in enumerate(param_names)}
+    c = P[pidx[obj_param]].copy()
+
+    filas_ub, signos_ub, lados_ub, filas_eq, lados_eq = [], [], [], [], []
+    for idx, (parametro, codigo, valor) in enumerate(restr_frozen):
+        if codigo == 0:  # ≤
+            filas_ub.append(pidx[parametro])
+            signos_ub.append(1.0)
+            lados_ub.append(valor)
+        elif codigo == 1:  # ≥
+            filas_ub.append(pidx[parametro])
+            signos_ub.append(-1.0)
+            lados_ub.append(-valor)
+        elif codigo == 2:  # =
+            filas_eq.append(pidx[parametro])
+            lados_eq.append(valor)
+        else:
+            raise ValueError(f"Restricción {idx+1}: El operador '{_OPERADORES[codigo]}' no es soportado por el solver.")
+
+    # HiGHS recibe A_ub y A_eq dispersas (CSR): solo se guardan los coeficientes no nulos de cada fila
+    P_csr = csr_matrix(P)
+    A_ub = diags(signos_ub) @ P_csr[filas_ub] if filas_ub else None
+    b_ub = np.array(lados_ub, dtype=float) if lados_ub else None
+    A_eq = P_csr[filas_eq] if filas_eq else None
+    b_eq = np.array(lados_eq, dtype=float) if lados_eq else None
+    return c, A_ub, b_ub, A_eq, b_eq
+
+@st.cache_data(max_entries=32)
+def _extract_expr_matrices(funcion_objetivo, restr_frozen, variables_tuple):
+    """
+    Versión memorizada de matrices_lineales para NLP/MILP/MINLP.
+    """
+    restricciones = [{'expresion': e, 'operador': o, 'valor': v} for e, o, v in restr_frozen]
+    return matrices_lineales(funcion_objetivo, restricciones, list(variables_tuple))
+
+# ---------------------------
+# Solvers de Pyomo
+# ---------------------------
+
+# HiGHS en proceso (appsi, sin archivos .lp ni subprocesos) para lo lineal; IPOPT para lo no lineal
+_SOLVER_MAP = {'lp': 'appsi_highs', 'milp': 'appsi_highs', 'nlp': 'ipopt'}
+
+def _resolver_pyomo(model, tipo):
+    """
+    Resuelve el modelo con el solver de _SOLVER_MAP y carga la solución solo si es óptima.
+    Si la librería de HiGHS (highspy) no está instalada se usa GLPK. Si el solver falla
+    (modelo no lineal para HiGHS, ejecutable no instalado, ...) se informa con st.error y se devuelve None.
+    """
+    solver = SolverFactory(_SOLVER_MAP[tipo])
+    if _SOLVER_MAP[tipo] == 'appsi_highs':
+        try:
+            disponible = solver.available(exception_flag=False)
+        except Exception:
+            disponible = False
+        if not disponible:
+            solver = SolverFactory('glpk')
+
+    try:
+        resultado = solver.solve(model, load_solutions=False)
+    except Exception as e:
+        st.error(f"El solver no pudo resolver el modelo: {e}")
+        if tipo == 'milp':
+            # Los MILP lineales van a linprog: a HiGHS solo llegan modelos que no reconoció como lineales
+            st.info("HiGHS solo resuelve modelos lineales; si el objetivo o alguna restricción no es lineal, "
+                    "use la calculadora de Programación No Lineal Mixta (MINLP).")
+        return None
+    if resultado.solver.termination_condition == TerminationCondition.optimal:
+        model.solutions.load_from(resultado)
+    return resultado
+
+# Los esqueletos se comparten entre sesiones: solo un hilo actualiza y resuelve a la vez
+_LOCK_ESQUELETOS = threading.Lock()
+
+@st.cache_resource(max_entries=16)
+def _build_skeleton(elementos, param_names, obj_param, estructura_restr, dominio):
+    """
+    Esqueleto del modelo LP/IP memorizado por estructura: nombres de elementos y parámetros y
+    pares (parámetro, código de operador) de las restricciones. Coeficientes y lados derechos son Param
+    mutables, de modo que cambiar un valor no obliga a reconstruir el modelo.
+    """
+    model = ConcreteModel()
+    model.i = Set(initialize=elementos)
+    model.p = Set(initialize=param_names)
+    model.k = RangeSet(len(estructura_restr))
+
+    model.coef = Param(model.p, model.i, mutable=True, initialize=0.0)
+    model.rhs = Param(model.k, mutable=True, initialize=0.0)
+    model.x = Var(model.i, within=NonNegativeReals if dominio == 'reales' else NonNegativeIntegers)
+
+    # LinearExpression arma cada suma de una sola vez en lugar de encadenar un nodo por '+'
+    variables = [model.x[e] for e in elementos]
+
+    def lineal(parametro):
+        return LinearExpression(constant=0.0, linear_coefs=[model.coef[parametro, e] for e in elementos],
+                                linear_vars=variables)
+
+    model.objetivo = Objective(expr=lineal(obj_param))
+
+    def regla(m, k):
+        parametro, codigo = estructura_restr[k-1]
+        return _OPS[_OPERADORES_CODIGO[codigo]](lineal(parametro), m.rhs[k])
+
+    model.restricciones = Constraint(model.k, rule=regla)
+    return model
+
+def _poke_and_solve(model, rhs_vector, coef_overrides, sentido, tipo):
+    """
+    Escribe en el esqueleto los lados derechos y coeficientes, lo resuelve y devuelve
+    (resultado, valor objetivo, {elemento: valor}); los valores son None si no es óptimo
+    y el resultado es None si el solver falló.
+    """
+    with _LOCK_ESQUELETOS:
+        for k, valor in enumerate(rhs_vector, start=1):
+            model.rhs[k].set_value(valor)
+        for (p, e), valor in coef_overrides.items():
+            model.coef[p, e].set_value(valor)
+        model.objetivo.set_sense(sentido)
+
+        resultado = _resolver_pyomo(model, tipo)
+        if resultado is None:
+            return None, None, None
+        if resultado.solver.termination_condition != TerminationCondition.optimal:
+            return resultado, None, None
+        return resultado, model.objetivo(), {e: model.x[e]() for e in model.i}
+
+# compile_expr recorre el árbol de forma recursiva y ast.parse tiene su propio límite de anidamiento
+_DEMASIADO_ANIDADA = "la expresión es demasiado larga o anidada."
+
+@st.cache_resource(max_entries=256)
+def _compilar(src, variables):
+    """
+    Valida y compila una expresión del usuario. Se memoriza a nivel de proceso porque las
+    calculadoras se crean de nuevo en cada rerun; así cada expresión se analiza una sola vez.
+    """
+    return compile_expr(src, variables)
+
+@st.cache_data(max_entries=256)
+def _es_lineal(expr, variables):
+    """
+    Versión memorizada de is_linear (compartida entre reruns y sesiones).
+    """
+    return is_linear(expr, variables)
+
+def _evaluar_real(compilada, punto):
+    """
+    Valor real y finito de la expresión en `punto`, o None si no se puede evaluar: error aritmético,
+    NaN o ±inf (p. ej. por desbordamiento de un producto) o resultado complejo
+    (con Python, (-1)**0.5 no falla sino que devuelve un complex).
+    """
+    try:
+        valor = compilada.evaluar(punto)
+    except (ArithmeticError, ValueError, TypeError):
+        return None
+    if isinstance(valor, complex) or not math.isfinite(valor):
+        return None
+    return float(valor)
+
+def _violacion(compiladas, punto):
+    """
+    Suma de las violaciones de las restricciones en `punto` (infinito si no se pueden evaluar).
+    """
+    total = 0.0
+    for compilada, op, valor in compiladas:
+        lado_izq = _evaluar_real(compilada, punto)
+        if lado_izq is None:
+            return float("inf")
+        if op == "<=":
+            total += max(0.0, lado_izq - valor)
+        elif op == ">=":
+            total += max(0.0, valor - lado_izq)
+        elif op == "==":
+            total += abs(lado_izq - valor)
+    return total
+
+def _mejor_punto(obj_compilada, compiladas, candidatos, sentido):
+    """
+    Entre los puntos candidatos elige el de menor violación de restricciones y, a igualdad, el de mejor objetivo.
+    """
+    signo = -1.0 if sentido == maximize else 1.0
+
+    def clave(punto):
+        objetivo = _evaluar_real(obj_compilada, punto)
+        objetivo = float("inf") if objetivo is None else signo * objetivo
+        return _violacion(compiladas, punto), objetivo
+    return min(candidatos, key=clave)
+
+# Retícula de arranque para MINLP: enteros en [-_RADIO_RETICULA, _RADIO_RETICULA], a lo sumo _MAX_CANDIDATOS puntos
+_RADIO_RETICULA = 3
+_MAX_CANDIDATOS = 2000
+
+def _reticula_entera(n_enteras, n_continuas):
+    """
+    Puntos candidatos con las variables enteras sobre una retícula centrada en el origen y las
+    continuas en 1.0. El radio se reduce con el número de enteras para no pasar de _MAX_CANDIDATOS.
+    """
+    radio = _RADIO_RETICULA
+    while radio > 0 and (2 * radio + 1) ** n_enteras > _MAX_CANDIDATOS:
+        radio -= 1
+    continuas = [1.0] * n_continuas
+    return [[float(k) for k in enteros] + continuas
+            for enteros in itertools.product(range(-radio, radio + 1), repeat=n_enteras)]
+
+def _matrices_si_lineal(funcion_objetivo, restricciones, variables):
+    """
+    Devuelve las matrices de linprog si el objetivo y todas las restricciones son lineales; si no, None.
+    """
+    if any(r['operador'] not in _OPS for r in restricciones):
+        return None
+    clave_vars = tuple(variables)
+    for expr in [funcion_objetivo] + [r['expresion'] for r in restricciones]:
+        if not _es_lineal(expr, clave_vars):
+            return None
+    restr_frozen = tuple((r['expresion'], r['operador'], r['valor']) for r in restricciones)
+    return _extract_expr_matrices(funcion_objetivo, restr_frozen, tuple(variables))
+
+def _resolver_linprog(nombres, c, A_ub, b_ub, A_eq, b_eq, sentido, bounds, integrality=None,
+                      constante=0.0, decimales=2, separador=": "):
+    """
+    Resuelve un problema lineal (entero o mixto si se indica `integrality`) con linprog y muestra el resultado.
+    """
+    signo = -1.0 if sentido == maximize else 1.0
+    res = linprog(signo * c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq,
+                  bounds=bounds, integrality=integrality, method="highs")
+
+    if res.status == 0:
+        valor_optimo = signo * res.fun + constante
+        st.success("✅ Optimización completada con éxito.")
+        st.markdown(f"**Valor óptimo de la función objetivo: {valor_optimo:.{decimales}f}**")
+        for nombre, x in zip(nombres, res.x):
+            st.write(f"{nombre}{separador}{x:.{decimales}f}")
+    else:
+        st.error("La optimización no encontró una solución óptima.")
+        st.write(f"🔍 Estado del solver: {res.message}")
+
+# ---------------------------
+# Clases base
+# ---------------------------
+
+class _BaseProgram:
+    """
+    Código común a todas las calculadoras. Cada subclase fija el prefijo de las claves de sus
+    widgets y de st.session_state, el título y su ejemplo por defecto.
+    """
+    _prefijo = ""
+    _titulo = ""
 
-class LP:
     def __init__(self):
-        self.elementos = []
-        self.parametros = {}
         self.restricciones = []
-        self.param_objetivo = ""
         self.tipo_objetivo = None
 
-    # ---------------------------
-    # Parsers
-    # ---------------------------
+    @property
+    def _clave_entradas(self):
+        return f"{self._prefijo}_entradas"
 
     def parse_lista(self, texto):
         """
         Convierte una cadena de texto separada por comas en una lista de elementos limpios.
         """
-        return [item.strip().replace(" ", "_") for item in texto.split(",") if item.strip()]
+        return _parse_lista(texto)
+
+    # ---------------------------
+    # Interfaz de Usuario (UI)
+    # ---------------------------
+
+    @_fragment
+    def render_inputs(self):
+        """
+        Entradas, botón "Resolver" y resultados en un mismo fragmento: al editar cualquier entrada
+        el fragmento se vuelve a ejecutar sin pulsar el botón y los resultados anteriores desaparecen.
+        """
+        self._widgets_entrada()
+
+        # Validar entradas y resolver modelo
+        if st.button("Resolver", key=f"{self._prefijo}_resolver"):
+            self.solve()
+
+    def interfaz(self):
+        st.subheader(self._titulo)
+        self.render_inputs()
+
+        if st.button("Salir", key=f"{self._prefijo}_salir"):
+            st.write(f"Has salido de la sección {self._prefijo.upper()}.")
+            st.stop()
+
+class _ProgramaParametrico(_BaseProgram):
+    """
+    Base de LP e IP: el modelo se arma desde una tabla de parámetros por elemento.
+    Las subclases fijan el dominio de las variables y el solver de Pyomo.
+    """
+    _dominio = 'reales'
+    _tipo_solver = 'lp'
+    _elementos_default = ""
+    _parametros_default = ""
+    _valores_default = {}
+    _restricciones_default = ()
+
+    def __init__(self, use_pyomo=False):
+        super().__init__()
+        self.elementos = []
+        self._elementos_set = frozenset()
+        self.parametros = {}
+        self.param_objetivo = ""
+        # Parámetros como matriz densa (parámetros × elementos) y fila de cada parámetro
+        self._P = None
+        self._pidx = {}
+        # Depuración: construir el modelo con Pyomo en lugar de linprog (HiGHS)
+        self.use_pyomo = use_pyomo
+
+    # ---------------------------
+    # Parsers
+    # ---------------------------
 
     def parse_restricciones(self, restricciones_input, param_names):
         """
-        Convierte las entradas de restricciones del usuario en una lista de diccionarios estructurados.
+        Convierte las entradas de restricciones del usuario en tuplas (parametro, codigo_operador, valor).
         """
-        restricciones = []
-        operadores_validos = {"≤": "<=", "≥": ">=", "=": "==", "<": "<", ">": ">", "≠": "!="}
-
-        for idx, restr in enumerate(restricciones_input):
-            parametro = restr.get('parametro')
-            operador = restr.get('operador')
-            valor = restr.get('valor')
-
-            if parametro not in param_names:
-                st.error(f"Restricción {idx+1}: Parámetro '{parametro}' no reconocido.")
-                continue
-            if operador not in operadores_validos:
-                st.error(f"Restricción {idx+1}: Operador '{operador}' no válido.")
-                continue
-            try:
-                valor = float(valor)
-            except ValueError:
-                st.error(f"Restricción {idx+1}: Valor '{valor}' no es numérico.")
-                continue
-
-            restricciones.append({
-                'parametro': parametro,
-                'operador': operadores_validos[operador],
-                'valor': valor
-            })
-        return restricciones
+        restricciones, errores = _parse_restricciones(restricciones_input, frozenset(param_names), _OP_CODIGOS)
+        for mensaje in errores:
+            st.error(mensaje)
+
+        return _descartar_estrictas(restricciones, [codigo for _, codigo, _ in restricciones])
 
     # ---------------------------
     # Validadores
@@ -60,10 +506,19 @@ class LP:
         """
         Verifica que cada parámetro tenga valores asignados para todos los elementos.
         """
+        # Longitud primero y luego pertenencia contra el dict, sin armar conjuntos por parámetro
+        n = len(self._elementos_set)
         for nombre_param in param_names:
-            valores = self.parametros.get(nombre_param, {})
-            if set(valores.keys()) != set(self.elementos):
-                st.error(f"El parámetro '{nombre_param}' no tiene valores para todos los elementos.")
+            valores = self.parametros.get(nombre_param) or {}
+            if len(valores) != n or not all(e in valores for e in self._elementos_set):
+                faltantes = self._elementos_set - valores.keys()
+                detalle = f" Faltan: {', '.join(sorted(faltantes))}." if faltantes else ""
+                st.error(f"El parámetro '{nombre_param}' no tiene valores para todos los elementos.{detalle}")
+                return False
+            # Una celda vaciada en la tabla llega como NaN (o None)
+            vacios = [e for e in self.elementos if valores[e] is None or valores[e] != valores[e]]
+            if vacios:
+                st.error(f"El parámetro '{nombre_param}' tiene celdas vacías: {', '.join(vacios)}.")
                 return False
         return True
 
@@ -71,613 +526,399 @@ class LP:
     # Constructor del Modelo
     # ---------------------------
 
-    def construir_modelo(self):
+    def _matriz_parametros(self, param_names):
         """
-        Construye y resuelve el modelo de programación lineal utilizando Pyomo.
+        Pasa los parámetros ya validados a una matriz densa de float64 (una fila por parámetro).
         """
-        model = ConcreteModel()
-        model.i = Set(initialize=self.elementos)
+        self._P = np.array([[self.parametros[p][e] for e in self.elementos] for p in param_names],
+                           dtype=np.float64).reshape(len(param_names), len(self.elementos))
+        self._pidx = {p: i for i, p in enumerate(param_names)}
 
-        # Definir parámetros
-        for pname in self.parametros:
-            model.add_component(pname, Param(model.i, initialize=self.parametros[pname]))
-
-        # Definir variables de decisión
-        model.x = Var(model.i, within=NonNegativeReals)
-
-        # Definir función objetivo
-        expr_objetivo = sum(getattr(model, self.param_objetivo)[i] * model.x[i] for i in model.i)
-        model.objetivo = Objective(expr=expr_objetivo, sense=self.tipo_objetivo)
+    def _build_matrices(self):
+        """
+        Arma los arreglos (c, A_ub, b_ub, A_eq, b_eq) de linprog directamente desde los parámetros.
+        Devuelve None si alguna restricción usa un operador que linprog no admite.
+        """
+        try:
+            return _extract_lp_matrices(self._P, tuple(self._pidx), tuple(self.restricciones), self.param_objetivo)
+        except ValueError as e:
+            st.error(str(e))
+            return None
 
-        # Definir restricciones
-        model.restricciones = ConstraintList()
-        for restr in self.restricciones:
-            expr = sum(getattr(model, restr['parametro'])[i] * model.x[i] for i in model.i)
-            if restr['operador'] == "<=":
-                model.restricciones.add(expr <= restr['valor'])
-            elif restr['operador'] == ">=":
-                model.restricciones.add(expr >= restr['valor'])
-            elif restr['operador'] == "==":
-                model.restricciones.add(expr == restr['valor'])
-            elif restr['operador'] == "<":
-                model.restricciones.add(expr < restr['valor'])
-            elif restr['operador'] == ">":
-                model.restricciones.add(expr > restr['valor'])
-            elif restr['operador'] == "!=":
-                model.restricciones.add(expr != restr['valor'])
-
-        # Resolver modelo
-        solver = SolverFactory('glpk')
-        resultado = solver.solve(model)
+    def construir_modelo(self):
+        """
+        Construye y resuelve el modelo con linprog (HiGHS), o con Pyomo en modo depuración.
+        """
+        if self.use_pyomo:
+            self._construir_modelo_pyomo()
+            return
 
-        # Mostrar resultados
-        if resultado.solver.status == 'ok' and resultado.solver.termination_condition == 'optimal':
-            st.success("✅ Optimización completada con éxito.")
-            st.markdown(f"**Valor óptimo de la función objetivo: {model.objetivo():.2f}**")
-            for i in model.i:
-                st.write(f"{i}: {model.x[i]():.2f}")
-        else:
-            st.error("La optimización no encontró una solución óptima.")
+        matrices = self._build_matrices()
+        if matrices is None:
+            return
+        c, A_ub, b_ub, A_eq, b_eq = matrices
+        integralidad = np.ones(len(self.elementos)) if self._dominio == 'enteros' else None
+        _resolver_linprog(self.elementos, c, A_ub, b_ub, A_eq, b_eq, self.tipo_objetivo,
+                          bounds=(0, None), integrality=integralidad)
 
-    # ---------------------------
-    # Interfaz de Usuario (UI)
-    # ---------------------------
+    def solve(self):
+        """
+        Parsea y valida las entradas guardadas por _widgets_entrada y resuelve el modelo.
+        """
+        entradas = st.session_state[self._clave_entradas]
+        self.elementos = entradas["elementos"]
+        self._elementos_set = frozenset(self.elementos)
+        self.parametros = entradas["parametros"]
+        self.param_objetivo = entradas["param_objetivo"]
+        self.tipo_objetivo = _SENSE[entradas["sentido"]]
+        param_names = entradas["param_names"]
+
+        self.restricciones = self.parse_restricciones(entradas["restricciones"], param_names)
+        if self.validar_parametros(param_names):
+            self._matriz_parametros(param_names)
+            self.construir_modelo()
 
-    def interfaz(self):
-        st.subheader("📦 Calculadora de Programación Lineal")
+    def _widgets_entrada(self):
+        """
+        Widgets de entrada; sus valores quedan en st.session_state para solve().
+        """
+        prefijo = self._prefijo
 
         # Paso 1: Ingresar nombres de elementos
-        elementos_default = "Desk, Table, Chairs"
-        parametros_default = "L, F, C, P"
-        param_values_default = {
-            "L": {"Desk": 8, "Table": 6, "Chairs": 1},
-            "F": {"Desk": 4, "Table": 2, "Chairs": 1.5},
-            "C": {"Desk": 2, "Table": 1.5, "Chairs": 0.5},
-            "P": {"Desk": 60, "Table": 30, "Chairs": 20}
-        }
-
-        elementos_input = st.text_input("Ingrese los nombres de los elementos separados por comas:", value=elementos_default)
-        self.elementos = self.parse_lista(elementos_input)
+        elementos_input = st.text_input("Ingrese los nombres de los elementos separados por comas:",
+                                        value=self._elementos_default)
+        elementos = self.parse_lista(elementos_input)
 
         # Paso 2: Ingresar nombres de parámetros
-        parametros_input = st.text_input("Ingrese los nombres de los parámetros separados por comas:", value=parametros_default)
+        parametros_input = st.text_input("Ingrese los nombres de los parámetros separados por comas:",
+                                         value=self._parametros_default)
         param_names = self.parse_lista(parametros_input)
 
-        # Paso 3: Asignar valores a los parámetros
+        # Paso 3: Asignar valores a los parámetros (una fila por elemento, una columna por parámetro)
         st.markdown("### Parámetros por elemento")
-        for pname in param_names:
-            self.parametros[pname] = {}
-            st.markdown(f"#### Parámetro `{pname}`")
-            for el in self.elementos:
-                # Usa el valor por defecto si existe, si no, usa 1.0
-                default_val = param_values_default.get(pname, {}).get(el, 1.0)
-                val = st.number_input(f"{pname}[{el}]", value=default_val, key=f"{pname}_{el}")
-                self.parametros[pname][el] = val
+        parametros = _tabla_parametros(self._valores_default, elementos, param_names, key=f"{prefijo}_params_grid")
 
         # Paso 4: Definir Función Objetivo
         st.markdown("### Definir Función Objetivo")
-        self.param_objetivo = st.selectbox("Seleccione el parámetro para la función objetivo:", param_names)
-        objetivo_input = st.selectbox("Seleccione la función objetivo:", ["Maximizar", "Minimizar"])
-        self.tipo_objetivo = maximize if objetivo_input == "Maximizar" else minimize
+        param_objetivo = st.selectbox("Seleccione el parámetro para la función objetivo:", param_names,
+                                      key=f"{prefijo}_obj")
+        objetivo_input = st.selectbox("Seleccione la función objetivo:", tuple(_SENSE), key=f"{prefijo}_tipo")
 
         # Paso 5: Definir Restricciones
         st.markdown("### Definir Restricciones")
-        num_restr = st.number_input("Cantidad de restricciones:", min_value=1, value=3, step=1)
-        operadores = ["≤", "≥", "=", "<", ">", "≠"]
-        restricciones_default = [
-            {"parametro": "L", "operador": "≤", "valor": 48},
-            {"parametro": "F", "operador": "≤", "valor": 20},
-            {"parametro": "C", "operador": "≤", "valor": 8},
-        ]
-        restricciones_input = []
-
-        for idx in range(int(num_restr)):
-            with st.expander(f"Restricción {idx+1}"):
-                # Usa valores por defecto si existen, si no, usa el primero de cada lista
-                def_param = restricciones_default[idx]["parametro"] if idx < len(restricciones_default) and restricciones_default[idx]["parametro"] in param_names else param_names[0]
-                def_op = restricciones_default[idx]["operador"] if idx < len(restricciones_default) else operadores[0]
-                def_val = restricciones_default[idx]["valor"] if idx < len(restricciones_default) else 10.0
-
-                parametro = st.selectbox(
-                    f"Seleccione el parámetro para la restricción {idx+1}:",
-                    param_names,
-                    index=param_names.index(def_param) if def_param in param_names else 0,
-                    key=f"param_{idx}"
-                )
-                operador = st.selectbox(
-                    f"Seleccione el operador para la restricción {idx+1}:",
-                    operadores,
-                    index=operadores.index(def_op) if def_op in operadores else 0,
-                    key=f"op_{idx}"
-                )
-                valor = st.number_input(
-                    f"Ingrese el valor para la restricción {idx+1}:",
-                    value=def_val,
-                    key=f"valor_{idx}"
-                )
-                restricciones_input.append({'parametro': parametro, 'operador': operador, 'valor': valor})
-        # Parsear y validar restricciones
-        self.restricciones = self.parse_restricciones(restricciones_input, param_names)
-
-        # Validar parámetros y resolver modelo
-        if st.button("Resolver"):
-            if self.validar_parametros(param_names):
-                self.construir_modelo()
-
-        if st.button("Salir", key="salir_boton_1"):
-            st.write("Has salido de la aplicación.")
-            st.stop()
-
-class IP:
-    def __init__(self):
-        self.elementos = []
-        self.parametros = {}
-        self.restricciones = []
-        self.param_objetivo = ""
-        self.tipo_objetivo = None
-
-    def parse_lista(self, texto):
-        return [item.strip().replace(" ", "_") for item in texto.split(",") if item.strip()]
-
-    def parse_restricciones(self, restricciones_input, param_names):
-        restricciones = []
-        operadores_validos = {"≤": "<=", "≥": ">=", "=": "==", "<": "<", ">": ">", "≠": "!="}
-        for idx, restr in enumerate(restricciones_input):
-            parametro = restr.get('parametro')
-            operador = restr.get('operador')
-            valor = restr.get('valor')
-            if parametro not in param_names:
-                st.error(f"Restricción {idx+1}: Parámetro '{parametro}' no reconocido.")
-                continue
-            if operador not in operadores_validos:
-                st.error(f"Restricción {idx+1}: Operador '{operador}' no válido.")
-                continue
-            try:
-                valor = float(valor)
-            except ValueError:
-                st.error(f"Restricción {idx+1}: Valor '{valor}' no es numérico.")
-                continue
-            restricciones.append({
-                'parametro': parametro,
-                'operador': operadores_validos[operador],
-                'valor': valor
-            })
-        return restricciones
-
-    def validar_parametros(self, param_names):
-        for nombre_param in param_names:
-            valores = self.parametros.get(nombre_param, {})
-            if set(valores.keys()) != set(self.elementos):
-                st.error(f"El parámetro '{nombre_param}' no tiene valores para todos los elementos.")
-                return False
-        return True
-
-    def construir_modelo(self):
-        model = ConcreteModel()
-        model.i = Set(initialize=self.elementos)
-
-        for pname in self.parametros:
-            model.add_component(pname, Param(model.i, initialize=self.parametros[pname]))
-
-        model.x = Var(model.i, domain=NonNegativeIntegers)  # tipo entero
+        restricciones_input = _tabla_restricciones(
+            _restricciones_con_parametros(self._restricciones_default, param_names), "parametro",
+            st.column_config.SelectboxColumn("Parámetro", options=param_names, required=True),
+            key=f"{prefijo}_restricciones_grid"
+        )
 
-        expr_objetivo = sum(getattr(model, self.param_objetivo)[i] * model.x[i] for i in model.i)
-        model.objetivo = Objective(expr=expr_objetivo, sense=self.tipo_objetivo)
+        # Solo se guardan las entradas: se parsean y validan al presionar "Resolver"
+        st.session_state[self._clave_entradas] = {
+            "elementos": elementos, "param_names": param_names, "parametros": parametros,
+            "param_objetivo": param_objetivo, "sentido": objetivo_input, "restricciones": restricciones_input,
+        }
 
-        model.restricciones = ConstraintList()
-        for restr in self.restricciones:
-            expr = sum(getattr(model, restr['parametro'])[i] * model.x[i] for i in model.i)
-            if restr['operador'] == "<=":
-                model.restricciones.add(expr <= restr['valor'])
-            elif restr['operador'] == ">=":
-                model.restricciones.add(expr >= restr['valor'])
-            elif restr['operador'] == "==":
-                model.restricciones.add(expr == restr['valor'])
-            elif restr['operador'] == "<":
-                model.restricciones.add(expr < restr['valor'])
-            elif restr['operador'] == ">":
-                model.restricciones.add(expr > restr['valor'])
-            elif restr['operador'] == "!=":
-                model.restricciones.add(expr != restr['valor'])
-
-        solver = SolverFactory('glpk')
-        resultado = solver.solve(model)
+    def _construir_modelo_pyomo(self):
+        """
+        Construye y resuelve el modelo utilizando Pyomo (modo depuración).
+        """
+        # Solo intervienen los parámetros usados en el objetivo o en alguna restricción
+        usados = {self.param_objetivo} | {parametro for parametro, _, _ in self.restricciones}
+
+        # El esqueleto solo depende de la estructura; los valores se escriben en sus Param mutables
+        estructura = tuple((parametro, codigo) for parametro, codigo, _ in self.restricciones)
+        model = _build_skeleton(tuple(self.elementos), tuple(sorted(usados)), self.param_objetivo, estructura,
+                                self._dominio)
+        rhs = [valor for _, _, valor in self.restricciones]
+        coef_overrides = {(p, e): a for p in usados for e, a in zip(self.elementos, self._P[self._pidx[p]].tolist())}
+        resultado, valor_objetivo, valores = _poke_and_solve(model, rhs, coef_overrides, self.tipo_objetivo,
+                                                             self._tipo_solver)
+        if resultado is None:
+            return
 
+        # Mostrar resultados
         if resultado.solver.status == 'ok' and resultado.solver.termination_condition == 'optimal':
             st.success("✅ Optimización completada con éxito.")
-            st.markdown(f"**Valor óptimo de la función objetivo: {model.objetivo():.2f}**")
-            for i in model.i:
-                st.write(f"{i}: {model.x[i]():.2f}")
+            st.markdown(f"**Valor óptimo de la función objetivo: {valor_objetivo:.2f}**")
+            for i, x in valores.items():
+                st.write(f"{i}: {x:.2f}")
         else:
             st.error("La optimización no encontró una solución óptima.")
 
-    def interfaz(self):
-        st.subheader("📦 Calculadora de Programación Entera")
-
-        # Ejemplo por defecto
-        elementos_default = "Caja1, Caja2"
-        parametros_default = "Ganancia, Tiempo"
-        param_values_default = {
-            "Ganancia": {"Caja1": 20, "Caja2": 30},
-            "Tiempo": {"Caja1": 4, "Caja2": 6}
-        }
-        restricciones_default = [
-            {"parametro": "Tiempo", "operador": "≤", "valor": 16},
-            {"parametro": "Ganancia", "operador": "≥", "valor": 40}
-        ]
-
-        elementos_input = st.text_input("Ingrese los nombres de los elementos separados por comas:", value=elementos_default)
-        self.elementos = self.parse_lista(elementos_input)
-
-        parametros_input = st.text_input("Ingrese los nombres de los parámetros separados por comas:", value=parametros_default)
-        param_names = self.parse_lista(parametros_input)
-
-        st.markdown("### Parámetros por elemento")
-        for pname in param_names:
-            self.parametros[pname] = {}
-            st.markdown(f"#### Parámetro `{pname}`")
-            for el in self.elementos:
-                default_val = param_values_default.get(pname, {}).get(el, 1.0)
-                val = st.number_input(f"{pname}[{el}]", value=default_val, key=f"ip_{pname}_{el}")
-                self.parametros[pname][el] = val
-
-        st.markdown("### Definir Función Objetivo")
-        self.param_objetivo = st.selectbox("Seleccione el parámetro para la función objetivo:", param_names, key="ip_obj")
-        objetivo_input = st.selectbox("Seleccione la función objetivo:", ["Maximizar", "Minimizar"], key="ip_tipo")
-        self.tipo_objetivo = maximize if objetivo_input == "Maximizar" else minimize
+class _ProgramaExpresiones(_BaseProgram):
+    """
+    Base de NLP, MILP y MINLP: el objetivo y las restricciones son expresiones en las variables.
+    Las subclases declaran las variables en el modelo (_declare_vars) y eligen el solver de Pyomo.
+    """
+    _tipo_solver = 'nlp'
+    # _enteras_default = None: sin variables enteras (una sola lista de variables, como en NLP)
+    _enteras_default = None
+    _continuas_default = ""
+    _objetivo_default = ""
+    _restricciones_default = ()
 
-        st.markdown("### Definir Restricciones")
-        num_restr = st.number_input("Cantidad de restricciones:", min_value=1, value=len(restricciones_default), step=1, key="ip_restr_count")
-        operadores = ["≤", "≥", "=", "<", ">", "≠"]
-        restricciones_input = []
-
-        for idx in range(int(num_restr)):
-            with st.expander(f"Restricción {idx+1}"):
-                def_param = restricciones_default[idx]["parametro"] if idx < len(restricciones_default) and restricciones_default[idx]["parametro"] in param_names else param_names[0]
-                def_op = restricciones_default[idx]["operador"] if idx < len(restricciones_default) else operadores[0]
-                def_val = restricciones_default[idx]["valor"] if idx < len(restricciones_default) else 10.0
-
-                parametro = st.selectbox(f"Seleccione el parámetro para la restricción {idx+1}:", param_names, index=param_names.index(def_param) if def_param in param_names else 0, key=f"ip_param_{idx}")
-                operador = st.selectbox(f"Seleccione el operador para la restricción {idx+1}:", operadores, index=operadores.index(def_op) if def_op in operadores else 0, key=f"ip_op_{idx}")
-                valor = st.number_input(f"Ingrese el valor para la restricción {idx+1}:", value=def_val, key=f"ip_valor_{idx}")
-                restricciones_input.append({'parametro': parametro, 'operador': operador, 'valor': valor})
-
-        self.restricciones = self.parse_restricciones(restricciones_input, param_names)
-
-        if st.button("Resolver", key="ip_resolver"):
-            if self.validar_parametros(param_names):
-                self.construir_modelo()
-
-        if st.button("Salir", key="ip_salir"):
-            st.write("Has salido de la sección IP.")
-            st.stop()
-
-class NLP:
     def __init__(self):
-        self.variables = []
+        super().__init__()
+        self.variables_enteras = []
+        self.variables_continuas = []
         self.funcion_objetivo = ""
-        self.tipo_objetivo = None
-        self.restricciones = []
 
-    def parse_lista(self, texto):
-        return [v.strip().replace(" ", "_") for v in texto.split(",") if v.strip()]
+    @property
+    def variables(self):
+        return self.variables_enteras + self.variables_continuas
 
-    def construir_modelo(self):
-        model = ConcreteModel()
-        model.vars = Var(self.variables, domain=Reals, initialize=1.0)
+    @variables.setter
+    def variables(self, nombres):
+        # Asignar `variables` directamente (como en NLP) las deja todas continuas
+        self.variables_enteras = []
+        self.variables_continuas = list(nombres)
 
-        try:
-            expr_obj = eval(self.funcion_objetivo, {}, {v: model.vars[v] for v in self.variables})
-            model.objetivo = Objective(expr=expr_obj, sense=self.tipo_objetivo)
-        except Exception as e:
-            st.error(f"Error en la función objetivo: {e}")
-            return
+    def _declare_vars(self, model):
+        """
+        Declara las variables en el modelo y devuelve {nombre: variable de Pyomo}.
+        """
+        raise NotImplementedError
 
-        model.restricciones = ConstraintList()
-        for restr in self.restricciones:
-            try:
-                lado_izq = eval(restr['expresion'], {}, {v: model.vars[v] for v in self.variables})
-                op = restr['operador']
-                valor = restr['valor']
-                if op == "<=":
-                    model.restricciones.add(lado_izq <= valor)
-                elif op == ">=":
-                    model.restricciones.add(lado_izq >= valor)
-                elif op == "==":
-                    model.restricciones.add(lado_izq == valor)
-                elif op == "<":
-                    model.restricciones.add(lado_izq < valor)
-                elif op == ">":
-                    model.restricciones.add(lado_izq > valor)
-                elif op == "!=":
-                    model.restricciones.add(lado_izq != valor)
-            except Exception as e:
-                st.error(f"Error en restricción: {e}")
-                return
+    def _candidatos_iniciales(self):
+        """
+        Puntos candidatos (en el orden de `variables`) para inicializar el solver; ninguno por defecto.
+        """
+        return []
 
-        solver = SolverFactory('ipopt')
-        resultado = solver.solve(model)
+    def _guardar_solucion(self, valores):
+        """
+        Recibe {variable: valor} cuando la optimización termina con éxito.
+        """
 
-        if resultado.solver.status == 'ok' and resultado.solver.termination_condition == 'optimal':
-            st.success("✅ Optimización completada con éxito.")
-            st.markdown(f"**Valor óptimo de la función objetivo: {model.objetivo():.4f}**")
-            for v in self.variables:
-                st.write(f"{v} = {model.vars[v]():.4f}")
+    def solve(self):
+        """
+        Toma las entradas guardadas por _widgets_entrada, descarta las restricciones inválidas y resuelve.
+        """
+        entradas = st.session_state[self._clave_entradas]
+        self.variables_enteras = entradas["enteras"]
+        self.variables_continuas = entradas["continuas"]
+        self.funcion_objetivo = entradas["funcion_objetivo"]
+        self.tipo_objetivo = _SENSE[entradas["sentido"]]
+        self.restricciones = _restricciones_desde_tabla(entradas["restricciones"])
+        self.construir_modelo()
+
+    def _widgets_entrada(self):
+        """
+        Widgets de entrada; sus valores quedan en st.session_state para solve().
+        """
+        if self._enteras_default is None:
+            enteras = []
+            continuas = self.parse_lista(st.text_input("Ingrese las variables separadas por coma:",
+                                                       value=self._continuas_default))
         else:
-            st.error("La optimización no encontró una solución óptima.")
-
-    def interfaz(self):
-        st.subheader("📐 Calculadora de Programación No Lineal (NLP)")
-
-        vars_input = st.text_input("Ingrese las variables separadas por coma:", value="x1, x2")
-        self.variables = self.parse_lista(vars_input)
+            enteras = self.parse_lista(st.text_input("Variables enteras (separadas por coma):",
+                                                     value=self._enteras_default))
+            continuas = self.parse_lista(st.text_input("Variables continuas (separadas por coma):",
+                                                       value=self._continuas_default))
 
         st.markdown("### Función Objetivo")
-        self.funcion_objetivo = st.text_input("Ingrese la función objetivo en términos de las variables:", value="80*x1 + 120*x2 - 3*x1**2 - 2*x2**2 - 0.8*x1*x2")
-        objetivo_input = st.selectbox("Seleccione el tipo de optimización:", [ "Maximizar", "Minimizar"], key="nlp_tipo")
-        self.tipo_objetivo = maximize if objetivo_input == "Maximizar" else minimize
+        funcion_objetivo = st.text_input("Ingrese la función objetivo:", value=self._objetivo_default)
+        objetivo_input = st.selectbox("Tipo de optimización:", tuple(_SENSE), key=f"{self._prefijo}_tipo")
 
         st.markdown("### Restricciones")
-        num_restr = st.number_input("Cantidad de restricciones:", min_value=0, value=1, step=1, key="nlp_num_restr")
-        operadores = ["≤", "≥","=", "<", ">", "≠"]
-        restricciones_input = []
-
-        for i in range(int(num_restr)):
-            with st.expander(f"Restricción {i+1}"):
-                expr = st.text_input(f"Expresión de la restricción {i+1} (lado izquierdo):", value="x1**2 + 1.5*x2**2", key=f"nlp_expr_{i}")
-                op = st.selectbox(f"Operador:", operadores, key=f"nlp_op_{i}")
-                val = st.number_input(f"Valor derecho de la restricción {i+1}:", value=500, key=f"nlp_val_{i}")
-                restricciones_input.append({
-                    'expresion': expr,
-                    'operador': {"≤": "<=", "≥": ">=", "=": "==", "<": "<", ">": ">", "≠": "!="}[op],
-                    'valor': val
-                })
-
-        self.restricciones = restricciones_input
-
-        if st.button("Resolver", key="nlp_resolver"):
-            self.construir_modelo()
 
-        if st.button("Salir", key="nlp_salir"):
-            st.write("Has salido de la sección NLP.")
-            st.stop()
+        # Lado izquierdo, operador y valor derecho de cada restricción
+        filas = _tabla_restricciones(self._restricciones_default, "expresion",
+                                     st.column_config.TextColumn("Expresión", required=True),
+                                     key=f"{self._prefijo}_restricciones_grid")
 
-class MILP:
-    def __init__(self):
-        self.variables_enteras = []
-        self.variables_continuas = []
-        self.funcion_objetivo = ""
-        self.tipo_objetivo = None
-        self.restricciones = []
-
-    def parse_lista(self, texto):
-        return [v.strip().replace(" ", "_") for v in texto.split(",") if v.strip()]
+        # Solo se guardan las entradas: se validan al presionar "Resolver"
+        st.session_state[self._clave_entradas] = {
+            "enteras": enteras, "continuas": continuas, "funcion_objetivo": funcion_objetivo,
+            "sentido": objetivo_input, "restricciones": filas,
+        }
 
     def construir_modelo(self):
-        model = ConcreteModel()
-
-        # Crear variables enteras y continuas como atributos del modelo
-        for v in self.variables_enteras:
-            setattr(model, v, Var(domain=Integers))
-        for v in self.variables_continuas:
-            setattr(model, v, Var(domain=Reals))
+        # Ruta rápida: si el problema es lineal se resuelve con linprog (HiGHS), sin pasar por Pyomo
+        variables = self.variables
+        matrices = _matrices_si_lineal(self.funcion_objetivo, self.restricciones, variables)
+        if matrices is not None:
+            c, c0, A_ub, b_ub, A_eq, b_eq = matrices
+            integralidad = None
+            if self.variables_enteras:
+                integralidad = [1] * len(self.variables_enteras) + [0] * len(self.variables_continuas)
+            _resolver_linprog(variables, c, A_ub, b_ub, A_eq, b_eq, self.tipo_objetivo, bounds=(None, None),
+                              integrality=integralidad, constante=c0, decimales=4, separador=" = ")
+            return
 
-        # Diccionario para acceder fácilmente a todas las variables por nombre
-        all_vars = {v: getattr(model, v) for v in self.variables_enteras + self.variables_continuas}
+        model = ConcreteModel()
+        vars_modelo = self._declare_vars(model)
+        clave_vars = tuple(variables)
 
         try:
-            expr_obj = eval(self.funcion_objetivo, {}, all_vars)
+            obj_compilada = _compilar(self.funcion_objetivo, clave_vars)
+            expr_obj = obj_compilada.pyomo(vars_modelo)
             model.objetivo = Objective(expr=expr_obj, sense=self.tipo_objetivo)
+        except RecursionError:
+            st.error(f"Error en la función objetivo: {_DEMASIADO_ANIDADA}")
+            return
         except Exception as e:
             st.error(f"Error en la función objetivo: {e}")
             return
 
+        try:
+            compiladas = [(_compilar(r['expresion'], clave_vars), r['operador'], r['valor'])
+                          for r in self.restricciones]
+        except (SyntaxError, ValueError) as e:
+            st.error(f"Error en restricción: {e}")
+            return
+        except RecursionError:
+            st.error(f"Error en restricción: {_DEMASIADO_ANIDADA}")
+            return
+
         model.restricciones = ConstraintList()
-        for restr in self.restricciones:
+        for compilada, op, valor in compiladas:
             try:
-                lado_izq = eval(restr['expresion'], {}, all_vars)
-                op = restr['operador']
-                valor = restr['valor']
-                if op == "<=":
-                    model.restricciones.add(lado_izq <= valor)
-                elif op == ">=":
-                    model.restricciones.add(lado_izq >= valor)
-                elif op == "==":
-                    model.restricciones.add(lado_izq == valor)
-                elif op == "<":
-                    model.restricciones.add(lado_izq < valor)
-                elif op == ">":
-                    model.restricciones.add(lado_izq > valor)
-                elif op == "!=":
-                    model.restricciones.add(lado_izq != valor)
+                lado_izq = compilada.pyomo(vars_modelo)
+                model.restricciones.add(_OPS[op](lado_izq, valor))
             except Exception as e:
                 st.error(f"Error en restricción: {e}")
                 return
 
+        # Punto inicial: el candidato que mejor se comporte al evaluarlo numéricamente
+        candidatos = self._candidatos_iniciales()
+        if candidatos:
+            punto = _mejor_punto(obj_compilada, compiladas, candidatos, self.tipo_objetivo)
+            for v, x in zip(variables, punto):
+                vars_modelo[v].set_value(x)
 
-        solver = SolverFactory('glpk')
-        resultado = solver.solve(model)
+        resultado = _resolver_pyomo(model, self._tipo_solver)
+        if resultado is None:
+            return
 
         if (
-            resultado.solver.status == SolverStatus.ok and 
+            resultado.solver.status == SolverStatus.ok and
             resultado.solver.termination_condition == TerminationCondition.optimal
         ):
+            valores = {v: vars_modelo[v]() for v in variables}
+            self._guardar_solucion(valores)
             st.success("✅ Optimización completada con éxito.")
             st.markdown(f"**Valor óptimo de la función objetivo: {model.objetivo():.4f}**")
-            for v in all_vars:
-                st.write(f"{v} = {all_vars[v]():.4f}")
+            for v, x in valores.items():
+                st.write(f"{v} = {x:.4f}")
         else:
             st.error("La optimización no encontró una solución óptima.")
             st.write(f"🔍 Estado del solver: {resultado.solver.status}")
             st.write(f"📌 Condición de terminación: {resultado.solver.termination_condition}")
 
+# ---------------------------
+# Calculadoras
+# ---------------------------
+
+class LP(_ProgramaParametrico):
+    _prefijo = "lp"
+    _titulo = "📦 Calculadora de Programación Lineal"
+    _elementos_default = "Desk, Table, Chairs"
+    _parametros_default = "L, F, C, P"
+    _valores_default = _aplanar({
+        "L": {"Desk": 8, "Table": 6, "Chairs": 1},
+        "F": {"Desk": 4, "Table": 2, "Chairs": 1.5},
+        "C": {"Desk": 2, "Table": 1.5, "Chairs": 0.5},
+        "P": {"Desk": 60, "Table": 30, "Chairs": 20}
+    })
+    _restricciones_default = (
+        ("L", "≤", 48),
+        ("F", "≤", 20),
+        ("C", "≤", 8),
+    )
+
+class IP(_ProgramaParametrico):
+    _dominio = 'enteros'
+    _tipo_solver = 'milp'
+    _prefijo = "ip"
+    _titulo = "📦 Calculadora de Programación Entera"
+    _elementos_default = "Caja1, Caja2"
+    _parametros_default = "Ganancia, Tiempo"
+    _valores_default = _aplanar({
+        "Ganancia": {"Caja1": 20, "Caja2": 30},
+        "Tiempo": {"Caja1": 4, "Caja2": 6}
+    })
+    _restricciones_default = (
+        ("Tiempo", "≤", 16),
+        ("Ganancia", "≥", 40),
+    )
+
+class NLP(_ProgramaExpresiones):
+    _prefijo = "nlp"
+    _titulo = "📐 Calculadora de Programación No Lineal (NLP)"
+    _continuas_default = "x1, x2"
+    _objetivo_default = "80*x1 + 120*x2 - 3*x1**2 - 2*x2**2 - 0.8*x1*x2"
+    _restricciones_default = (("x1**2 + 1.5*x2**2", "≤", 500),)
+
+    def _declare_vars(self, model):
+        model.vars = Var(self.variables, domain=Reals, initialize=1.0)
+        return {v: model.vars[v] for v in self.variables}
+
+    def _candidatos_iniciales(self):
+        # Punto inicial para IPOPT: la última solución encontrada o el punto por defecto
+        candidatos = [[1.0] * len(self.variables)]
+        anterior = st.session_state.get("nlp_solucion")
+        if anterior is not None and list(anterior) == self.variables:
+            candidatos.insert(0, list(anterior.values()))
+        return candidatos
+
+    def _guardar_solucion(self, valores):
+        st.session_state["nlp_solucion"] = valores
+
+class MILP(_ProgramaExpresiones):
+    _tipo_solver = 'milp'
+    _prefijo = "milp"
+    _titulo = "📐 Calculadora de Programación Entera Mixta (MILP)"
+    _enteras_default = "x"
+    _continuas_default = "y, z"
+    _objetivo_default = "x + 2*y + 3*z"
+    _restricciones_default = (
+        ("x + y", "≤", 10),
+        ("y + z", "≥", 5),
+        ("x", "≥", 20),
+        ("y", "≥", 11),
+        ("z", "≤", 100),
+    )
+
+    def _declare_vars(self, model):
+        # Crear variables enteras y continuas como atributos del modelo
+        for v in self.variables_enteras:
+            setattr(model, v, Var(domain=Integers))
+        for v in self.variables_continuas:
+            setattr(model, v, Var(domain=Reals))
 
-    def interfaz(self):
-        st.subheader("📐 Calculadora de Programación Entera Mixta (MILP)")
-
-        # Ejemplo por defecto
-        enteras_default = "x"
-        continuas_default = "y, z"
-        funcion_objetivo_default = "x + 2*y + 3*z"
-        restricciones_default = [
-            {"expresion": "x + y", "operador": "<=", "valor": 10},
-            {"expresion": "y + z", "operador": ">=", "valor": 5},
-            {"expresion": "x", "operador": ">=", "valor":20},
-            {"expresion": "y", "operador": ">=", "valor":11},
-            {"expresion": "z", "operador": "<=", "valor": 100}
-        ]
-
-
-        enteras_input = st.text_input("Variables enteras (separadas por coma):", value=enteras_default)
-        continuas_input = st.text_input("Variables continuas (separadas por coma):", value=continuas_default)
-
-        self.variables_enteras = self.parse_lista(enteras_input)
-        self.variables_continuas = self.parse_lista(continuas_input)
-
-        st.markdown("### Función Objetivo")
-        self.funcion_objetivo = st.text_input("Ingrese la función objetivo:", value=funcion_objetivo_default)
-        objetivo_input = st.selectbox("Tipo de optimización:", ["Maximizar", "Minimizar"], key="milp_tipo")
-        self.tipo_objetivo =maximize if objetivo_input == "Maximizar" else minimize
-
-        st.markdown("### Restricciones")
-        num_restr = st.number_input("Cantidad de restricciones:", min_value=0, value=len(restricciones_default), step=1, key="milp_num_restr")
-        operadores = ["≤", "≥", "=", "<", ">", "≠"]
-        restricciones_input = []
-
-        for i in range(int(num_restr)):
-            with st.expander(f"Restricción {i+1}"):
-                def_expr = restricciones_default[i]["expresion"] if i < len(restricciones_default) else "x + y"
-                def_op = restricciones_default[i]["operador"] if i < len(restricciones_default) else operadores[0]
-                def_val = restricciones_default[i]["valor"] if i < len(restricciones_default) else 10.0
-
-                expr = st.text_input(f"Expresión {i+1}:", value=def_expr, key=f"milp_expr_{i}")
-                op = st.selectbox("Operador:", operadores, index=operadores.index(def_op) if def_op in operadores else 0, key=f"milp_op_{i}")
-                val = st.number_input("Valor derecho:", value=def_val, key=f"milp_val_{i}")
-                restricciones_input.append({
-                    'expresion': expr,
-                    'operador': {"≤": "<=", "≥": ">=", "=": "==", "<": "<", ">": ">", "≠": "!="}[op],
-                    'valor': val
-                })
-
-        self.restricciones = restricciones_input
-
-        if st.button("Resolver", key="milp_resolver"):
-            self.construir_modelo()
-
-        if st.button("Salir", key="milp_salir"):
-            st.write("Has salido de la sección MILP.")
-            st.stop()
-
-class MINLP:
-    def __init__(self):
-        self.variables_enteras = []
-        self.variables_continuas = []
-        self.funcion_objetivo = ""
-        self.tipo_objetivo = None
-        self.restricciones = []
-
-    def parse_lista(self, texto):
-        return [v.strip().replace(" ", "_") for v in texto.split(",") if v.strip()]
-
-    def construir_modelo(self):
-        model = ConcreteModel()
-
+        # Diccionario para acceder fácilmente a todas las variables por nombre
+        return {v: getattr(model, v) for v in self.variables}
+
+class MINLP(_ProgramaExpresiones):
+    _tipo_solver = 'nlp'  # ✅ Cambiar _SOLVER_MAP['nlp'] a 'bonmin' en caso de tener problemas con 'ipopt'
+    _prefijo = "minlp"
+    _titulo = "📐 Calculadora de Programación No Lineal Mixta (MINLP)"
+    _enteras_default = "x"
+    _continuas_default = "y, z"
+    _objetivo_default = "x**2 + 2*y**2 + 3*z + x*y"
+    # ✅ Restricciones predefinidas
+    _restricciones_default = (
+        ("x + y + z", "≤", 10.0),
+        ("x**2 + y", "≥", 2.0),
+        ("y + z**2", "≤", 8.0),
+        ("x", "≥", 0.0),
+        ("y", "≥", 0.0),
+    )
+
+    def _declare_vars(self, model):
         # ✅ Combinar todas las variables para indexar
-        todas_las_vars = self.variables_enteras + self.variables_continuas
+        todas_las_vars = self.variables
         model.vars = Var(todas_las_vars, domain=Reals)
 
         # ✅ Cambiar el dominio de las variables enteras
         for v in self.variables_enteras:
             model.vars[v].domain = Integers
-
-        try:
-            expr_obj = eval(self.funcion_objetivo, {}, {v: model.vars[v] for v in model.vars})
-            model.objetivo = Objective(expr=expr_obj, sense=self.tipo_objetivo)
-        except Exception as e:
-            st.error(f"Error en la función objetivo: {e}")
-            return
-
-        model.restricciones = ConstraintList()
-        for restr in self.restricciones:
-            try:
-                lado_izq = eval(restr['expresion'], {}, {v: model.vars[v] for v in model.vars})
-                op = restr['operador']
-                valor = restr['valor']
-                if op == "<=":
-                    model.restricciones.add(lado_izq <= valor)
-                elif op == ">=":
-                    model.restricciones.add(lado_izq >= valor)
-                elif op == "==":
-                    model.restricciones.add(lado_izq == valor)
-                elif op == "<":
-                    model.restricciones.add(lado_izq < valor)
-                elif op == ">":
-                    model.restricciones.add(lado_izq > valor)
-                elif op == "!=":
-                    model.restricciones.add(lado_izq != valor)
-            except Exception as e:
-                st.error(f"Error en restricción: {e}")
-                return
-
-        solver = SolverFactory('ipopt') #✅ Cambiar el solver a 'bonmin' en caso de tener problemas con 'ipopt'
-        resultado = solver.solve(model)
-
-        if resultado.solver.status == 'ok' and resultado.solver.termination_condition == 'optimal':
-            st.success("✅ Optimización completada con éxito.")
-            st.markdown(f"**Valor óptimo de la función objetivo: {model.objetivo():.4f}**")
-            for v in model.vars:
-                st.write(f"{v} = {model.vars[v]():.4f}")
-        else:
-            st.error("La optimización no encontró una solución óptima.")
-
-    def interfaz(self):
-        st.subheader("📐 Calculadora de Programación No Lineal Mixta (MINLP)")
-
-                # ✅ Valores por defecto del caso de prueba
-        enteras_input = st.text_input("Variables enteras (separadas por coma):", value="x")
-        continuas_input = st.text_input("Variables continuas (separadas por coma):", value="y, z")
-
-        self.variables_enteras = self.parse_lista(enteras_input)
-        self.variables_continuas = self.parse_lista(continuas_input)
-
-        st.markdown("### Función Objetivo")
-        self.funcion_objetivo = st.text_input(
-            "Ingrese la función objetivo:",
-            value="x**2 + 2*y**2 + 3*z + x*y"
-        )
-        objetivo_input = st.selectbox("Tipo de optimización:", [ "Maximizar", "Minimizar"], key="minlp_tipo")
-        self.tipo_objetivo = minimize if objetivo_input == "Minimizar" else maximize
-
-        st.markdown("### Restricciones")
-        num_restr = st.number_input("Cantidad de restricciones:", min_value=0, value=5, step=1, key="minlp_num_restr")
-        operadores = ["≤", "≥", "=", "<", ">", "≠"]
-        restricciones_input = []
-
-        # ✅ Restricciones predefinidas
-        valores_defecto = [
-            ("x + y + z", "≤", 10.0),
-            ("x**2 + y", "≥", 2.0),
-            ("y + z**2", "≤", 8.0),
-            ("x", "≥", 0.0),
-            ("y", "≥", 0.0),
-        ]
-        for i in range(int(num_restr)):
-            with st.expander(f"Restricción {i+1}"):
-                expr_default, op_default, val_default = valores_defecto[i] if i < len(valores_defecto) else ("", "≤", 0.0)
-                expr = st.text_input(f"Expresión {i+1}:", value=expr_default, key=f"minlp_expr_{i}")
-                op = st.selectbox("Operador:", operadores, index=operadores.index(op_default), key=f"minlp_op_{i}")
-                val = st.number_input("Valor derecho:", value=val_default, key=f"minlp_val_{i}")
-                restricciones_input.append({
-                    'expresion': expr,
-                    'operador': {"≤": "<=", "≥": ">=", "=": "==", "<": "<", ">": ">", "≠": "!="}[op],
-                    'valor': val
-                })
-
-        self.restricciones = restricciones_input
-
-        if st.button("Resolver", key="minlp_resolver"):
-            self.construir_modelo()
-
-        if st.button("Salir", key="minlp_salir"):
-            st.write("Has salido de la sección MINLP.")
-            st.stop()
\ No newline at end of file
+        return {v: model.vars[v] for v in todas_las_vars}
+
+    def _candidatos_iniciales(self):
+        # Se evalúan objetivo y restricciones ya compilados sobre una retícula de enteros;
+        # el punto más factible se pasa a IPOPT como valor inicial
+        if not self.variables_enteras:
+            return []
+        return _reticula_entera(len(self.variables_enteras), len(self.variables_continuas))